@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 
 from safeqr.utils import validators
@@ -14,6 +17,56 @@ except ImportError as exc:  # pragma: no cover - окружение без за
         "Не найдена библиотека qrcode. Установите зависимости через 'pip install qrcode[pil]'."
     ) from exc
 
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - окружение без зависимости
+    raise ImportError(
+        "Не найдена библиотека numpy. Установите зависимости через 'pip install numpy'."
+    ) from exc
+
+try:
+    from PIL import Image
+except ImportError as exc:  # pragma: no cover - окружение без зависимости
+    raise ImportError(
+        "Не найдена библиотека Pillow. Установите зависимости через 'pip install qrcode[pil]'."
+    ) from exc
+
+
+# Каталоги, существование которых уже проверено в этом процессе
+_PREPARED_DIRS: set[Path] = set()
+# Экземпляры QRCode переиспользуются и не потокобезопасны
+_QR_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _get_qr(version: int, box_size: int, border: int) -> "qrcode.QRCode":
+    """Возвращает общий экземпляр QRCode для заданных параметров."""
+    return qrcode.QRCode(
+        version=version,
+        error_correction=qrcode.constants.ERROR_CORRECT_Q,
+        box_size=box_size,
+        border=border,
+    )
+
+
+def _render_matrix(matrix: "np.ndarray", box_size: int) -> Image.Image:
+    """Растягивает матрицу модулей в чёрно-белое изображение одной операцией."""
+    pixels = np.kron(matrix, np.ones((box_size, box_size), dtype=np.uint8))
+    # В режиме "1" True — белый пиксель, поэтому инвертируем тёмные модули
+    return Image.fromarray(pixels == 0)
+
+
+@lru_cache(maxsize=64)
+def _prepare_path(filename: str) -> Path:
+    """Готовит путь к файлу QR; каталог создаётся один раз на процесс."""
+    path = Path(filename).expanduser()
+    if not path.suffix:
+        path = path.with_suffix(".png")
+    if path.parent not in _PREPARED_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _PREPARED_DIRS.add(path.parent)
+    return path
+
 
 def _sanitize_payload(data: str) -> str:
     """Проводит минимальную проверку и нормализацию исходных данных."""
@@ -29,28 +82,56 @@ def _sanitize_payload(data: str) -> str:
     return cleaned
 
 
+def build_qr_image(
+    data: str, *, version: int = 4, box_size: int = 10, border: int = 4
+) -> Image.Image:
+    """Строит изображение QR-кода в памяти, не сохраняя его на диск."""
+    payload = _sanitize_payload(data)
+    try:
+        with _QR_LOCK:
+            qr = _get_qr(version, box_size, border)
+            qr.clear()
+            # make(fit=True) подбирает версию начиная с текущей — сбрасываем её
+            qr.version = version
+            qr.add_data(payload)
+            qr.make(fit=True)
+            # get_matrix() уже содержит рамку; True — тёмный модуль
+            matrix = np.array(qr.get_matrix(), dtype=np.uint8)
+        return _render_matrix(matrix, box_size)
+    except Exception as exc:  # pragma: no cover - защита
+        log_error("QR_GENERATION_FAILED", str(exc))
+        raise
+
+
+def generate_qr_bytes(
+    data: str, *, version: int = 4, box_size: int = 10, border: int = 4
+) -> bytes:
+    """Создаёт QR-код и возвращает его как PNG-байты, минуя файловую систему."""
+    img = build_qr_image(data, version=version, box_size=box_size, border=border)
+    buffer = BytesIO()
+    try:
+        img.save(buffer, format="PNG")
+    except Exception as exc:  # pragma: no cover - защита
+        log_error("QR_GENERATION_FAILED", str(exc))
+        raise
+    log_event("QR_GENERATED", f"PNG в памяти: {buffer.tell()} байт")
+    return buffer.getvalue()
+
+
 def generate_qr(
     data: str, filename: str, *, version: int = 4, box_size: int = 10, border: int = 4
 ) -> str:
     """Создаёт QR-код и сохраняет его в файл, возвращая путь к файлу."""
-    payload = _sanitize_payload(data)
-
-    path = Path(filename).expanduser()
-    if not path.suffix:
-        path = path.with_suffix(".png")
-    path.parent.mkdir(parents=True, exist_ok=True)
+    img = build_qr_image(data, version=version, box_size=box_size, border=border)
+    path = _prepare_path(filename)
 
     try:
-        qr = qrcode.QRCode(
-            version=version,
-            error_correction=qrcode.constants.ERROR_CORRECT_Q,
-            box_size=box_size,
-            border=border,
-        )
-        qr.add_data(payload)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(path)
+        try:
+            img.save(path, format="PNG")
+        except FileNotFoundError:
+            # Каталог удалили после первой проверки — создаём его заново
+            path.parent.mkdir(parents=True, exist_ok=True)
+            img.save(path, format="PNG")
         log_event("QR_GENERATED", f"Файл: {path}")
         return str(path)
     except Exception as exc:  # pragma: no cover - защита
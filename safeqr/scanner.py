@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +16,12 @@ except ImportError as exc:  # pragma: no cover - отсутствие cv2
         "Не найдена библиотека opencv-python. Установите зависимости."
     ) from exc
 
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError as exc:  # pragma: no cover - отсутствие numpy
+    raise ImportError("Не найдена библиотека numpy. Установите зависимости.") from exc
+
 try:
     from pyzbar.pyzbar import decode  # type: ignore
 except ImportError as exc:  # pragma: no cover - отсутствие pyzbar
@@ -21,11 +29,103 @@ except ImportError as exc:  # pragma: no cover - отсутствие pyzbar
 
 
 _DEF_CAMERA_INDEX = 0
-
-
-def _decode_frame(frame) -> Optional[str]:
-    """Пытается найти QR-код в кадре и вернуть его данные."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+_CAMERA_FRAME_SIZE = (960, 540)
+_PRODUCER_JOIN_TIMEOUT = 1.0  # секунды ожидания потока захвата при остановке
+_MAX_DECODE_HEIGHT = 720  # выше этого кадр уменьшается перед распознаванием
+_PREFILTER_ROW_STEP = 2  # для поиска поисковых узоров хватает каждой второй строки
+_PREFILTER_BLOCK = 51  # окно локального порога, больше центра поискового узора
+_PREFILTER_CONTRAST = 15  # насколько пиксель темнее окрестности, чтобы считаться тёмным
+_FULL_DECODE_EVERY = 10  # каждый N-й кадр камеры распознаётся без предфильтра
+_FINDER_RATIO = np.array([1, 1, 3, 1, 1])
+# Детектор OpenCV не потокобезопасен: камера и файлы могут сканироваться параллельно
+_DETECTOR = cv2.QRCodeDetector()
+_DETECTOR_LOCK = threading.Lock()
+
+
+class _LatestFrame:
+    """Слот на один кадр: поток захвата публикует, сканер забирает самый свежий."""
+
+    def __init__(self) -> None:
+        self._frame = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def is_empty(self) -> bool:
+        """Сообщает, что предыдущий кадр уже забран и нужен новый."""
+        return not self._ready.is_set()
+
+    def publish(self, frame) -> None:
+        with self._lock:
+            self._frame = frame
+            self._ready.set()
+
+    def take(self, timeout: float):
+        """Ждёт кадр не дольше timeout секунд; возвращает None, если его нет."""
+        if not self._ready.wait(timeout):
+            return None
+        with self._lock:
+            frame, self._frame = self._frame, None
+            self._ready.clear()
+        return frame
+
+
+def _has_finder_pattern(gray) -> bool:
+    """Ищет в строках кадра серии 1:1:3:1:1, с которых начинается любой QR-код."""
+    rows = np.ascontiguousarray(gray[::_PREFILTER_ROW_STEP])
+    # Порог локальный: при неравномерном освещении общий средний уровень кадра
+    # относит QR в тени или на ярком фоне целиком к одному цвету
+    dark = cv2.adaptiveThreshold(
+        rows,
+        1,
+        cv2.ADAPTIVE_THRESH_MEAN_C,
+        cv2.THRESH_BINARY_INV,
+        _PREFILTER_BLOCK,
+        _PREFILTER_CONTRAST,
+    ).view(bool)
+    width = dark.shape[1]
+    # Начало каждой серии одного цвета; начало строки всегда открывает новую серию
+    boundaries = np.ones(dark.shape, dtype=bool)
+    boundaries[:, 1:] = dark[:, 1:] != dark[:, :-1]
+    starts = np.flatnonzero(boundaries)
+    if starts.size < 5:
+        return False
+    lengths = np.diff(starts, append=boundaries.size)
+    row_ids = starts // width
+    # Окно из пяти серий должно лежать в одной строке и начинаться с тёмной серии
+    first = np.flatnonzero((row_ids[:-4] == row_ids[4:]) & dark.ravel()[starts[:-4]])
+    if first.size == 0:
+        return False
+    runs = sliding_window_view(lengths, 5)[first]
+    # |run - module·w| < module·w/2 при module = total/7, в целых числах
+    total = runs.sum(axis=1, keepdims=True)
+    deviation = np.abs(14 * runs - 2 * total * _FINDER_RATIO)
+    fits = (deviation < total * _FINDER_RATIO).all(axis=1)
+    return bool(fits.any())
+
+
+def _decode_frame(
+    frame, *, downscale: bool = False, prefilter: bool = False
+) -> Optional[str]:
+    """Пытается найти QR-код в кадре и вернуть его данные.
+
+    downscale уменьшает крупные кадры камеры; файлы распознаются в исходном
+    разрешении, иначе мелкие QR на скриншотах теряются.
+    """
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if downscale and gray.shape[0] > _MAX_DECODE_HEIGHT:
+        # В видеопотоке хватает половинного разрешения, а декодеры работают за O(W·H)
+        gray = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+    if prefilter and not _has_finder_pattern(gray):
+        return None
+    try:
+        with _DETECTOR_LOCK:
+            data, _, _ = _DETECTOR.detectAndDecode(gray)
+    except cv2.error:
+        data = ""
+    data = data.strip()
+    if data:
+        return data
+    # pyzbar остаётся запасным вариантом для кадров, которые OpenCV не осилил
     detections = decode(gray)
     for detection in detections:
         data = detection.data.decode("utf-8", errors="ignore").strip()
@@ -34,13 +134,37 @@ def _decode_frame(frame) -> Optional[str]:
     return None
 
 
+def _capture_frames(capture, slot: _LatestFrame, stop: threading.Event) -> None:
+    """Непрерывно вычитывает камеру, чтобы в буфере драйвера не копились кадры.
+
+    Камеру освобождает сам поток захвата: release() из другого потока,
+    пока здесь висит grab(), приводит к неопределённому поведению.
+    """
+    try:
+        while not stop.is_set():
+            # grab() лишь забирает кадр из буфера, без дорогого декодирования
+            if not capture.grab():
+                log_warning("CAMERA_STREAM", "Не удалось получить кадр")
+                stop.wait(0.03)
+                continue
+            # Декодируем кадр только тогда, когда сканер готов его обработать
+            if not slot.is_empty():
+                continue
+            ret, frame = capture.retrieve()
+            if ret:
+                slot.publish(frame)
+    finally:
+        capture.release()
+
+
 def scan_from_file(path: str) -> Optional[str]:
     """Сканирует QR-код из изображения."""
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"Файл не найден: {file_path}")
 
-    image = cv2.imread(str(file_path))
+    # Декодерам нужен только один канал — сразу читаем файл в оттенках серого
+    image = cv2.imread(str(file_path), cv2.IMREAD_GRAYSCALE)
     if image is None:
         raise ValueError(
             "Не удалось считать изображение. Поддерживаются форматы PNG/JPEG."
@@ -62,27 +186,45 @@ def scan_from_camera(timeout: float = 15.0) -> Optional[str]:
         log_error("CAMERA", "Не удалось открыть камеру")
         raise RuntimeError("Камера недоступна")
 
+    # Держим в буфере драйвера только последний кадр, чтобы не копить задержку
+    capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    # MJPEG заметно легче YUY2 для USB-шины; формат задаётся до размеров кадра
+    capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, _CAMERA_FRAME_SIZE[0])
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, _CAMERA_FRAME_SIZE[1])
     # Простая имитация автофокуса
     capture.set(cv2.CAP_PROP_AUTOFOCUS, 1)
 
     payload: Optional[str] = None
+    slot = _LatestFrame()
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_capture_frames, args=(capture, slot, stop), daemon=True
+    )
+    producer.start()
+    deadline = time.monotonic() + timeout
     frame_count = 0
-    max_frames = int(timeout * 30)  # предполагаем 30 FPS
 
     try:
-        while frame_count < max_frames:
-            ret, frame = capture.read()
-            frame_count += 1
-            if not ret:
-                log_warning("CAMERA_STREAM", "Не удалось получить кадр")
+        while (remaining := deadline - time.monotonic()) > 0:
+            frame = slot.take(remaining)
+            if frame is None:
                 continue
-            payload = _decode_frame(frame)
+            frame_count += 1
+            # Кадры без поисковых узоров QR пропускаем, не запуская декодеры;
+            # периодический полный проход страхует от промахов предфильтра
+            prefilter = frame_count % _FULL_DECODE_EVERY != 0
+            payload = _decode_frame(frame, downscale=True, prefilter=prefilter)
             if payload:
                 log_event("QR_SCANNED_CAMERA", "QR найден через камеру")
                 break
             cv2.waitKey(1)
     finally:
-        capture.release()
+        stop.set()
+        producer.join(timeout=_PRODUCER_JOIN_TIMEOUT)
+        if producer.is_alive():
+            # Драйвер завис в grab(): камера освободится, когда поток из него выйдет
+            log_warning("CAMERA", "Поток захвата не завершился вовремя")
         cv2.destroyAllWindows()
 
     if payload is None:
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Final, List, Optional
 from urllib.parse import urlsplit, parse_qsl
 
 from safeqr.utils import validators
 
+try:
+    from rapidfuzz import fuzz
+except ImportError as exc:  # pragma: no cover - окружение без зависимости
+    raise ImportError(
+        "Не найдена библиотека rapidfuzz. Установите зависимости через 'pip install rapidfuzz'."
+    ) from exc
+
 _SUSPICIOUS_WORDS: Final[list[str]] = [
     "login",
     "verify",
@@ -22,6 +30,10 @@ _SUSPICIOUS_WORDS: Final[list[str]] = [
     "auth",
 ]
 
+_SUSPICIOUS_RE: Final[re.Pattern[str]] = re.compile(
+    "|".join(map(re.escape, _SUSPICIOUS_WORDS))
+)
+
 _KNOWN_BRANDS: Final[list[str]] = [
     "microsoft.com",
     "google.com",
@@ -36,6 +48,10 @@ _KNOWN_BRANDS: Final[list[str]] = [
     "bank.kz",
 ]
 
+_SPOOF_RATIO: Final[float] = 0.82
+
+_REDIRECT_RE: Final[re.Pattern[str]] = re.compile(r"\?redirect=|//@")
+
 _SUSPICIOUS_PARAMS: Final[set[str]] = {
     "redirect",
     "redir",
@@ -49,6 +65,11 @@ _SUSPICIOUS_PARAMS: Final[set[str]] = {
     "goto",
 }
 
+_BAD_PARAM_RE: Final[re.Pattern[str]] = re.compile(
+    r"(?:^|&)(?:%s)(?:=|&|$)" % "|".join(map(re.escape, sorted(_SUSPICIOUS_PARAMS))),
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class SecurityReport:
@@ -57,6 +78,7 @@ class SecurityReport:
     safe: bool
     warnings: List[str]
     risk_level: str
+    normalized: Optional[str] = None
 
     def as_dict(self) -> dict:
         """Удобное представление результата в виде словаря."""
@@ -64,6 +86,7 @@ class SecurityReport:
             "safe": self.safe,
             "warnings": self.warnings,
             "risk_level": self.risk_level,
+            "normalized": self.normalized,
         }
 
 
@@ -96,35 +119,52 @@ def _normalize_if_url(value: str) -> Optional[str]:
 
 
 def _check_redirects(url_lower: str, warnings: List[str]) -> None:
-    if "?redirect=" in url_lower or "//@" in url_lower:
+    if _REDIRECT_RE.search(url_lower):
         warnings.append("Обнаружены признаки редиректов (redirect или //@).")
 
 
 def _check_keywords(url_lower: str, warnings: List[str]) -> None:
+    found = {match.group() for match in _SUSPICIOUS_RE.finditer(url_lower)}
+    if not found:
+        return
+    # Каждое слово упоминается один раз и в порядке списка, как и раньше
     for word in _SUSPICIOUS_WORDS:
-        if word in url_lower:
+        if word in found:
             warnings.append(f"Подозрительное слово в ссылке: {word}.")
 
 
-def _contains_brand_fragment(domain_skeleton: str, brand_label: str) -> bool:
-    brand_skeleton = validators.ascii_skeleton(brand_label)
-    domain_compact = "".join(ch for ch in domain_skeleton if ch.isalnum())
-    brand_compact = "".join(ch for ch in brand_skeleton if ch.isalnum())
+def _compact(value: str) -> str:
+    """Оставляет в строке только буквы и цифры."""
+    return "".join(ch for ch in value if ch.isalnum())
+
+
+def _contains_brand_fragment(domain_compact: str, brand_compact: str) -> bool:
     if not domain_compact or not brand_compact:
         return False
     if brand_compact in domain_compact:
         return True
     if len(domain_compact) < len(brand_compact):
         domain_compact, brand_compact = brand_compact, domain_compact
-    for idx in range(len(domain_compact) - len(brand_compact) + 1):
-        chunk = domain_compact[idx : idx + len(brand_compact)]
-        if SequenceMatcher(None, chunk, brand_compact).ratio() >= 0.85:
-            return True
-    return False
+    width = len(brand_compact)
+    # Только окна во всю длину бренда: partial_ratio засчитывает и короткие
+    # совпадения на краях строки, и "bank" находится в "bananacom"
+    return any(
+        fuzz.ratio(domain_compact[idx : idx + width], brand_compact, score_cutoff=85)
+        for idx in range(len(domain_compact) - width + 1)
+    )
 
 
 def _check_query_params(parsed, warnings: List[str]) -> None:
-    if not parsed.query:
+    query = parsed.query
+    if not query:
+        return
+    # Быстрый путь: без %-экранирования ключи и значения видны в строке как есть,
+    # и если в ней нет ни подозрительных ключей, ни http://, разбирать её незачем
+    if (
+        "%" not in query
+        and "http://" not in query.lower()
+        and not _BAD_PARAM_RE.search(query)
+    ):
         return
     try:
         params = parse_qsl(parsed.query, keep_blank_values=True)
@@ -142,20 +182,44 @@ def _check_query_params(parsed, warnings: List[str]) -> None:
             )
 
 
-def _check_domain_spoof(domain: str, warnings: List[str]) -> None:
+def _build_brand_table() -> list[tuple[str, str, str]]:
+    """Заранее готовит бренд, его метку и ASCII-скелет метки без разделителей."""
+    labels = [brand.split(".", 1)[0] for brand in _KNOWN_BRANDS]
+    skeletons = validators.ascii_skeleton_many(labels)
+    return [
+        (brand, label, _compact(skeleton))
+        for brand, label, skeleton in zip(_KNOWN_BRANDS, labels, skeletons)
+    ]
+
+
+_BRAND_TABLE: Final[list[tuple[str, str, str]]] = _build_brand_table()
+
+
+def _brand_ratio(domain: str, domain_len: int, brand: str) -> float:
+    """Сходство домена с брендом; заведомо непохожие пары отсекаются без подсчёта."""
+    brand_len = len(brand)
+    # Сходство не превышает 2·min/(a+b): при большой разнице длин считать нечего
+    if 2 * min(domain_len, brand_len) <= _SPOOF_RATIO * (domain_len + brand_len):
+        return 0.0
+    return fuzz.ratio(domain, brand, score_cutoff=_SPOOF_RATIO * 100) / 100.0
+
+
+@lru_cache(maxsize=1024)
+def _domain_spoof_warnings(domain: str) -> tuple[str, ...]:
+    """Считает предупреждения о подмене домена один раз на каждый домен."""
+    warnings: List[str] = []
     unicode_domain = validators.to_unicode_domain(domain)
-    domain_skeleton = validators.ascii_skeleton(unicode_domain)
-    for brand in _KNOWN_BRANDS:
-        ratio = SequenceMatcher(None, unicode_domain, brand).ratio()
+    domain_compact = _compact(validators.ascii_skeleton(unicode_domain))
+    domain_len = len(unicode_domain)
+    for brand, brand_label, brand_compact in _BRAND_TABLE:
         if unicode_domain.endswith(brand):
             continue
-        if 0.82 < ratio < 1:
+        if _SPOOF_RATIO < _brand_ratio(unicode_domain, domain_len, brand) < 1:
             warnings.append(
                 f"Домен '{unicode_domain}' похож на '{brand}' (возможная подмена)."
             )
             break
-        brand_label = brand.split(".", 1)[0]
-        if _contains_brand_fragment(domain_skeleton, brand_label):
+        if _contains_brand_fragment(domain_compact, brand_compact):
             warnings.append(
                 f"В домене '{unicode_domain}' обнаружен фрагмент, похожий на бренд '{brand_label}'."
             )
@@ -164,6 +228,11 @@ def _check_domain_spoof(domain: str, warnings: List[str]) -> None:
         domain
     ):
         warnings.append("Обнаружен punycode или необычные символы в домене.")
+    return tuple(warnings)
+
+
+def _check_domain_spoof(domain: str, warnings: List[str]) -> None:
+    warnings.extend(_domain_spoof_warnings(domain))
 
 
 def check_url_safety(url: str) -> dict:
@@ -195,4 +264,6 @@ def check_url_safety(url: str) -> dict:
 
     safe = not warnings
     risk = _assess_risk(warnings)
-    return SecurityReport(safe=safe, warnings=warnings, risk_level=risk).as_dict()
+    return SecurityReport(
+        safe=safe, warnings=warnings, risk_level=risk, normalized=normalized
+    ).as_dict()
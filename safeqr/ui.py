@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 import threading
-import tempfile
-from pathlib import Path
 import tkinter as tk
+from collections import deque
 from tkinter import (
     BOTH,
     CENTER,
@@ -23,13 +22,15 @@ from tkinter import (
 )
 from tkinter import ttk
 from tkinter import scrolledtext
-from typing import Optional
+from typing import Deque, Optional
 
 from PIL import Image, ImageTk
 
 from safeqr import generator, scanner, security
 from safeqr.utils import validators
-from safeqr.utils.logger import get_log_path, log_error
+from safeqr.utils.logger import get_log_path, log_error, log_event, read_log_tail
+
+_RECENT_LIMIT = 10
 
 
 class SafeQRApp(ttk.Frame):
@@ -42,10 +43,9 @@ class SafeQRApp(ttk.Frame):
         self.master.minsize(800, 500)
         self.pack(fill=BOTH, expand=True)
 
-        self.preview_path = Path(tempfile.gettempdir()) / "safeqr_preview.png"
         self.preview_image: Optional[ImageTk.PhotoImage] = None
         self.latest_payload: Optional[str] = None
-        self.recent_checks: list[tuple[str, str]] = []
+        self._link_item_ids: Deque[str] = deque(maxlen=_RECENT_LIMIT)
 
         self._build_ui()
 
@@ -142,18 +142,21 @@ class SafeQRApp(ttk.Frame):
     def _handle_generate(self) -> None:
         data = self.input_var.get()
         try:
-            result_path = generator.generate_qr(data, str(self.preview_path))
+            # Предпросмотр строится в памяти: на диск QR пишется только при сохранении
+            image = generator.build_qr_image(data)
+            log_event("QR_GENERATED", f"Предпросмотр: {image.width}x{image.height} px")
             self.latest_payload = data
-            self._show_preview(result_path)
-            messagebox.showinfo("Успех", f"QR-код создан: {result_path}")
+            self._show_preview(image)
+            messagebox.showinfo(
+                "Успех", "QR-код создан. Сохраните его в файл при необходимости."
+            )
         except Exception as exc:
             log_error("GUI_GENERATE", str(exc))
             messagebox.showerror("Ошибка", str(exc))
 
-    def _show_preview(self, image_path: str) -> None:
-        with Image.open(image_path) as image:
-            image.thumbnail((350, 350))
-            self.preview_image = ImageTk.PhotoImage(image)
+    def _show_preview(self, image: Image.Image) -> None:
+        image.thumbnail((350, 350))
+        self.preview_image = ImageTk.PhotoImage(image)
         self.preview_label.configure(image=self.preview_image, text="")
 
     def _handle_save(self) -> None:
@@ -211,7 +214,8 @@ class SafeQRApp(ttk.Frame):
         self.scan_result_var.set(f"Результат: {payload}")
         report = security.check_url_safety(payload)
         self._update_security_ui(report)
-        self._remember_link(payload, report["risk_level"])
+        normalized = report["normalized"] or validators.normalize_url(payload)
+        self._remember_link(normalized, report["risk_level"])
 
     def _update_security_ui(self, report: dict) -> None:
         risk = report["risk_level"]
@@ -239,20 +243,18 @@ class SafeQRApp(ttk.Frame):
         log_path = get_log_path()
         content = "Файл журнала ещё не создан."
         if log_path.exists():
-            content = log_path.read_text(encoding="utf-8")
+            content = read_log_tail()
         self.log_view.configure(state="normal")
         self.log_view.delete("1.0", END)
         self.log_view.insert(END, content)
         self.log_view.configure(state="disabled")
 
-    def _remember_link(self, url: str, risk: str) -> None:
-        normalized = validators.normalize_url(url)
-        self.recent_checks.append((normalized, risk))
-        self.recent_checks = self.recent_checks[-10:]
-        for row in self.links_table.get_children():
-            self.links_table.delete(row)
-        for link, risk_level in self.recent_checks:
-            self.links_table.insert("", END, values=(link, risk_level.upper()))
+    def _remember_link(self, normalized: str, risk: str) -> None:
+        # Таблица обновляется точечно: добавляем новую строку и убираем самую старую
+        if len(self._link_item_ids) == _RECENT_LIMIT:
+            self.links_table.delete(self._link_item_ids.popleft())
+        item_id = self.links_table.insert("", END, values=(normalized, risk.upper()))
+        self._link_item_ids.append(item_id)
         self._update_log_view()
 
 
@@ -2,23 +2,50 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import atexit
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Final
+from typing import Final, Optional, TextIO
 
 _LOG_FILE: Final[Path] = Path(__file__).resolve().parent.parent / "safeqr.log"
+_LOG_LOCK: Final = threading.Lock()
+_TAIL_BYTES: Final[int] = 64 * 1024
+_log_handle: Optional[TextIO] = None
+# Последняя отформатированная секунда: (unix-время, строка метки)
+_last_stamp: tuple[int, str] = (-1, "")
+
+
+def _close() -> None:
+    """Закрывает файл журнала при завершении процесса."""
+    global _log_handle
+    with _LOG_LOCK:
+        if _log_handle is not None:
+            _log_handle.close()
+            _log_handle = None
 
 
 def _write(message: str) -> None:
     """Сохраняет строку сообщения в файл журнала."""
-    _LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with _LOG_FILE.open("a", encoding="utf-8") as log_file:
-        log_file.write(f"{message}\n")
+    global _log_handle
+    with _LOG_LOCK:
+        if _log_handle is None:
+            _LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            # Построчная буферизация: каждая запись сразу видна читателям журнала
+            _log_handle = _LOG_FILE.open("a", encoding="utf-8", buffering=1)
+            atexit.register(_close)
+        _log_handle.write(f"{message}\n")
 
 
 def _format_entry(event: str, details: str) -> str:
     """Формирует строку журнала в соответствии с требованиями."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _last_stamp
+    second = int(time.time())
+    cached_second, timestamp = _last_stamp
+    if second != cached_second:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _last_stamp = (second, timestamp)
     return f"[{timestamp}] {event.upper()}: {details}"
 
 
@@ -40,3 +67,16 @@ def log_error(event: str, details: str) -> None:
 def get_log_path() -> Path:
     """Возвращает путь к файлу журнала."""
     return _LOG_FILE
+
+
+def read_log_tail(max_bytes: int = _TAIL_BYTES) -> str:
+    """Читает только конец журнала (не больше max_bytes), начиная с целой строки."""
+    with _LOG_FILE.open("rb") as log_file:
+        size = log_file.seek(0, os.SEEK_END)
+        start = max(0, size - max_bytes)
+        log_file.seek(start)
+        chunk = log_file.read()
+    if start:
+        # Первая строка окна почти наверняка обрезана — отбрасываем её
+        _, _, chunk = chunk.partition(b"\n")
+    return chunk.decode("utf-8", errors="ignore")
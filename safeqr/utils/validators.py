@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import codecs
 import ipaddress
-import re
-from typing import Final
+from functools import lru_cache
+from itertools import chain
+from typing import Final, Iterable
 from unicodedata import normalize
 from urllib.parse import quote, unquote, urlsplit, urlunsplit
 
-_ALLOWED_SCHEMES: Final[set[str]] = {"http", "https"}
+_ALLOWED_SCHEMES: Final[frozenset[str]] = frozenset({"http", "https"})
+# Символы пути, которые quote(..., safe="/:%") оставляет без изменений (кроме "%")
+_PATH_SAFE_CHARS: Final[frozenset[str]] = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~/:"
+)
+# Одни и те же домены и ссылки проверяются многократно (история, повторные сканы)
+_CACHE_SIZE: Final[int] = 4096
+# Кодек ищем один раз при импорте, а не в реестре на каждый вызов decode
+_IDNA_DECODE: Final = codecs.lookup("idna").decode
 _ASCII_CONFUSABLES: Final[dict[str, str]] = {
     "0": "o",
     "1": "l",
@@ -82,12 +92,35 @@ _GREEK_TO_LATIN: Final[dict[str, str]] = {
     "ψ": "ps",
     "ω": "o",
 }
-_UNICODE_CONFUSABLES: Final[dict[str, str]] = {}
-for source, mapping in list(_CYR_TO_LATIN.items()) + list(_GREEK_TO_LATIN.items()):
-    _UNICODE_CONFUSABLES[source] = mapping
-    upper = source.upper()
-    if upper != source:
-        _UNICODE_CONFUSABLES[upper] = mapping
+_UNICODE_CONFUSABLES: Final[dict[str, str]] = {
+    variant: mapping
+    for source, mapping in chain(_CYR_TO_LATIN.items(), _GREEK_TO_LATIN.items())
+    for variant in (source, source.upper())
+}
+
+# Плотная таблица замен для кодов ниже U+0500 (ASCII, греческий, кириллица):
+# str.translate индексирует её напрямую, а более старшие символы (IndexError)
+# оставляет как есть — для них срабатывает NFKD-разбор.
+_SKELETON_LUT_SIZE: Final[int] = 0x500
+
+
+def _build_skeleton_lut() -> tuple[str, ...]:
+    table = [chr(code) for code in range(_SKELETON_LUT_SIZE)]
+    for code in range(ord("A"), ord("Z") + 1):
+        table[code] = chr(code + 32)
+    for mapping in (_UNICODE_CONFUSABLES, _ASCII_CONFUSABLES):
+        for char, replacement in mapping.items():
+            table[ord(char)] = replacement
+    return tuple(table)
+
+
+_SKELETON_LUT: Final[tuple[str, ...]] = _build_skeleton_lut()
+# Управляющий символ-разделитель для пакетного построения скелетов
+_BATCH_SEPARATOR: Final[str] = "\x1f"
+# Кириллица U+0400–U+04FF и строчные греческие α–ω
+_SUSPICIOUS_CHARS: Final[frozenset[str]] = frozenset(
+    chr(code) for code in chain(range(0x0400, 0x0500), range(0x03B1, 0x03CA))
+)
 
 
 def is_ip_address(value: str) -> bool:
@@ -101,13 +134,18 @@ def is_ip_address(value: str) -> bool:
 
 def contains_punycode(domain: str) -> bool:
     """Ищет punycode-ярлыки внутри домена."""
-    return any(part.startswith("xn--") for part in domain.lower().split("."))
+    lowered = domain.lower()
+    # Подстрока ищется за один проход; метки разбираем только при совпадении
+    if "xn--" not in lowered:
+        return False
+    return any(part.startswith("xn--") for part in lowered.split("."))
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def to_unicode_domain(domain: str) -> str:
     """Преобразует punycode-домен в привычное представление."""
     try:
-        return domain.encode("ascii").decode("idna")
+        return _IDNA_DECODE(domain.encode("ascii"))[0]
     except (UnicodeError, ValueError):
         return domain
 
@@ -119,15 +157,40 @@ def is_valid_url(value: str) -> bool:
     parsed = urlsplit(value.strip())
     if not parsed.scheme or not parsed.netloc:
         return False
-    if parsed.scheme.lower() not in _ALLOWED_SCHEMES:
+    scheme = parsed.scheme
+    if (scheme if scheme.islower() else scheme.lower()) not in _ALLOWED_SCHEMES:
         return False
     return True
 
 
+def _is_normalized_url(url: str) -> bool:
+    """Проверяет, что normalize_url вернул бы строку без изменений."""
+    if not url.startswith(("https://", "http://")):
+        return False
+    if not url.isascii() or not url.isprintable() or any(ch in url for ch in " %#[]"):
+        return False
+    rest = url[url.index("//") + 2 :]
+    authority_end = len(rest)
+    for delimiter in "/?":
+        position = rest.find(delimiter)
+        if position != -1:
+            authority_end = min(authority_end, position)
+    if authority_end == 0:
+        return False
+    path, has_query, query = rest[authority_end:].partition("?")
+    # Пустой запрос после "?" urlunsplit отбрасывает
+    if has_query and not query:
+        return False
+    return _PATH_SAFE_CHARS.issuperset(path)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def normalize_url(url: str) -> str:
     """Нормализует URL: добавляет схему, кодирует path и убирает мусор."""
     if not url:
         return ""
+    if _is_normalized_url(url):
+        return url
     url = url.strip()
     parsed = urlsplit(url)
     scheme = parsed.scheme.lower() or "https"
@@ -141,6 +204,7 @@ def normalize_url(url: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def extract_domain(url: str) -> str:
     """Возвращает доменную часть URL без учёта схемы и пути."""
     parsed = urlsplit(url)
@@ -153,33 +217,38 @@ def extract_domain(url: str) -> str:
 def has_suspicious_unicode(domain: str) -> bool:
     """Находит очевидные признаки подмены домена за счёт Unicode."""
     clean = to_unicode_domain(domain)
-    return bool(re.search(r"[\u0400-\u04FF\u03B1-\u03C9]", clean))
+    # Чисто ASCII-домен не может содержать кириллицу или греческие буквы
+    if clean.isascii():
+        return False
+    return not _SUSPICIOUS_CHARS.isdisjoint(clean)
+
+
+def _skeletonize(text: str) -> str:
+    """Общий конвейер скелета: NFKC, таблица гомографов и снятие диакритики."""
+    # Для ASCII-строк NFKC ничего не меняет — пропускаем нормализацию
+    normalized = text if text.isascii() else normalize("NFKC", text)
+    skeleton = normalized.translate(_SKELETON_LUT)
+    if skeleton.isascii():
+        return skeleton
+    # unicode.normalize + ascii игнор помогают убрать диакритику у оставшихся символов
+    decomposed = normalize("NFKD", skeleton)
+    return decomposed.encode("ascii", "ignore").decode("ascii").lower()
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def ascii_skeleton(value: str) -> str:
     """Возвращает ASCII-скелет строки: заменяет популярные гомографы на латиницу."""
     if not value:
         return ""
-    clean = to_unicode_domain(value)
-    normalized = normalize("NFKC", clean)
-    skeleton: list[str] = []
-    for char in normalized:
-        mapped_ascii = _ASCII_CONFUSABLES.get(char)
-        if mapped_ascii is not None:
-            skeleton.append(mapped_ascii)
-            continue
-        if ord(char) < 128:
-            skeleton.append(char.lower())
-            continue
-        mapped = _UNICODE_CONFUSABLES.get(char)
-        if mapped:
-            skeleton.append(mapped.lower())
-            continue
-        # unicode.normalize + ascii игнор помогают убрать диакритику
-        decomposed = normalize("NFKD", char)
-        ascii_equiv = (
-            decomposed.encode("ascii", "ignore").decode("ascii", "ignore").lower()
-        )
-        if ascii_equiv:
-            skeleton.append(ascii_equiv)
-    return "".join(skeleton)
+    return _skeletonize(to_unicode_domain(value))
+
+
+def ascii_skeleton_many(values: Iterable[str]) -> list[str]:
+    """Строит ASCII-скелеты пачки строк за один проход NFKC и translate."""
+    items = list(values)
+    if not items:
+        return []
+    if any(_BATCH_SEPARATOR in item for item in items):
+        return [ascii_skeleton(item) for item in items]
+    joined = _BATCH_SEPARATOR.join(map(to_unicode_domain, items))
+    return _skeletonize(joined).split(_BATCH_SEPARATOR)
@@ -3,32 +3,54 @@
 from __future__ import annotations
 
 import base64
+import os
 import tempfile
 from collections import deque
-from pathlib import Path
-from typing import Deque, Dict, Optional
+from typing import Deque, Dict, Optional, Tuple
 
 from fastapi import FastAPI, File, Form, Request, UploadFile
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 
 from safeqr import generator, scanner, security
 from safeqr.utils import validators
-from safeqr.utils.logger import get_log_path, log_error
+from safeqr.utils.logger import get_log_path, log_error, read_log_tail
 
-app = FastAPI(title="SafeQR", description="Генератор и сканер безопасных QR-кодов")
-_templates = Jinja2Templates(
-    directory=str(Path(__file__).resolve().parent / "templates")
+app = FastAPI(
+    title="SafeQR",
+    description="Генератор и сканер безопасных QR-кодов",
+    default_response_class=ORJSONResponse,
 )
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+_templates = Jinja2Templates(directory=_TEMPLATE_DIR)
 _recent_checks: Deque[Dict[str, str]] = deque(maxlen=10)
+# История меняется только в /scan, поэтому остальные запросы берут готовый снимок
+_recent_snapshot: Tuple[Dict[str, str], ...] = ()
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+_log_cache: Optional[Tuple[Tuple[int, int, int], str]] = None
 
 
 def _read_log_tail(limit: int = 200) -> str:
-    log_path = get_log_path()
-    if not log_path.exists():
+    global _log_cache
+    try:
+        stat = get_log_path().stat()
+    except FileNotFoundError:
         return "Журнал пока пуст."
-    content = log_path.read_text(encoding="utf-8").strip().splitlines()
-    return "\n".join(content[-limit:]) if content else "Журнал пока пуст."
+    # Журнал не менялся с прошлого запроса — отдаём уже подготовленный хвост
+    key = (stat.st_mtime_ns, stat.st_size, limit)
+    if _log_cache is not None and _log_cache[0] == key:
+        return _log_cache[1]
+    content = read_log_tail().strip().splitlines()
+    tail = "\n".join(content[-limit:]) if content else "Журнал пока пуст."
+    _log_cache = (key, tail)
+    return tail
+
+
+def _remember_check(entry: Dict[str, str]) -> None:
+    """Добавляет проверку в историю и обновляет неизменяемый снимок для шаблона."""
+    global _recent_snapshot
+    _recent_checks.appendleft(entry)
+    _recent_snapshot = tuple(_recent_checks)
 
 
 def _build_context(request: Request, **extra) -> dict:
@@ -39,18 +61,13 @@ def _build_context(request: Request, **extra) -> dict:
         "scan_result": None,
         "security_report": None,
         "error": None,
-        "recent_checks": list(_recent_checks),
+        "recent_checks": _recent_snapshot,
         "log_content": _read_log_tail(),
     }
     context.update({key: value for key, value in extra.items() if value is not None})
     return context
 
 
-def _encode_image(path: str) -> str:
-    raw = Path(path).read_bytes()
-    return base64.b64encode(raw).decode("ascii")
-
-
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request) -> HTMLResponse:
     """Отображает главную страницу."""
@@ -60,20 +77,13 @@ async def home(request: Request) -> HTMLResponse:
 @app.post("/generate", response_class=HTMLResponse)
 async def generate_qr_route(request: Request, data: str = Form(...)) -> HTMLResponse:
     """Создаёт QR и отображает результат на странице."""
-    tmp_path: Optional[str] = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_file:
-            tmp_path = tmp_file.name
-        result_path = generator.generate_qr(data, tmp_path)
-        image_b64 = _encode_image(result_path)
-        Path(result_path).unlink(missing_ok=True)
+        raw = generator.generate_qr_bytes(data)
+        image_b64 = base64.b64encode(raw).decode("ascii")
         context = {"qr_image": image_b64, "qr_payload": data}
     except Exception as exc:
         log_error("WEB_GENERATE", str(exc))
         context = {"error": str(exc)}
-    finally:
-        if tmp_path:
-            Path(tmp_path).unlink(missing_ok=True)
     return _templates.TemplateResponse("index.html", _build_context(request, **context))
 
 
@@ -82,29 +92,32 @@ async def scan_route(request: Request, qr_file: UploadFile = File(...)) -> HTMLR
     """Принимает изображение QR и выводит найденный текст и отчёт."""
     tmp_path: Optional[str] = None
     try:
-        contents = await qr_file.read()
-        if not contents:
-            raise ValueError("Загружен пустой файл.")
-        suffix = Path(qr_file.filename or "qr.png").suffix or ".png"
+        suffix = os.path.splitext(qr_file.filename or "qr.png")[1] or ".png"
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(contents)
             tmp_path = tmp_file.name
+            # Пишем загрузку на диск частями, не держа весь файл в памяти
+            while chunk := await qr_file.read(_UPLOAD_CHUNK_SIZE):
+                tmp_file.write(chunk)
+            is_empty = tmp_file.tell() == 0
+        if is_empty:
+            raise ValueError("Загружен пустой файл.")
         payload = scanner.scan_from_file(tmp_path)
         if not payload:
             context = {"scan_result": "QR-код не найден"}
         else:
             report = security.check_url_safety(payload)
-            normalized = validators.normalize_url(payload)
-            _recent_checks.appendleft(
-                {"url": normalized, "risk": report["risk_level"].upper()}
-            )
+            normalized = report["normalized"] or validators.normalize_url(payload)
+            _remember_check({"url": normalized, "risk": report["risk_level"].upper()})
             context = {"scan_result": payload, "security_report": report}
     except Exception as exc:
         log_error("WEB_SCAN", str(exc))
         context = {"error": str(exc)}
     finally:
         if tmp_path:
-            Path(tmp_path).unlink(missing_ok=True)
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
     return _templates.TemplateResponse("index.html", _build_context(request, **context))
 
 
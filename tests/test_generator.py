@@ -24,3 +24,21 @@ def test_generate_qr_creates_png_in_target_path(tmp_path: Path) -> None:
 def test_generate_qr_rejects_empty_payload(tmp_path: Path) -> None:
     with pytest.raises(ValueError):
         generator.generate_qr("   ", str(tmp_path / "qr.png"))
+
+
+def test_build_qr_image_returns_square_image_in_memory() -> None:
+    image = generator.build_qr_image("https://example.com", box_size=4, border=2)
+    width, height = image.size
+    assert width == height
+    assert width % 4 == 0
+
+
+def test_reused_qr_instance_shrinks_back_after_long_payload() -> None:
+    short_size = generator.build_qr_image("https://example.com").size
+    generator.build_qr_image("https://example.com/" + "a" * 500)
+    assert generator.build_qr_image("https://example.com").size == short_size
+
+
+def test_generate_qr_bytes_returns_png() -> None:
+    raw = generator.generate_qr_bytes("https://example.com")
+    assert raw.startswith(b"\x89PNG\r\n\x1a\n")
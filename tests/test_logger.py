@@ -0,0 +1,24 @@
+"""Тесты утилит журнала."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from safeqr.utils import logger
+
+
+def test_read_log_tail_returns_only_whole_trailing_lines(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    log_file = tmp_path / "safeqr.log"
+    lines = [f"[2025-01-01 00:00:00] EVENT: запись {idx}" for idx in range(100)]
+    log_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.setattr(logger, "_LOG_FILE", log_file)
+
+    tail = logger.read_log_tail(max_bytes=200)
+
+    assert len(tail.encode("utf-8")) <= 200
+    assert tail.splitlines()[-1] == lines[-1]
+    assert all(line in lines for line in tail.splitlines())
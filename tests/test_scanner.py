@@ -0,0 +1,148 @@
+"""Тесты сканера QR-кодов без обращения к реальной камере."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pyzbar.pyzbar")
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from safeqr import generator, scanner
+
+
+class _FakeCapture:
+    """Имитация VideoCapture, отдающая один и тот же кадр."""
+
+    def __init__(self) -> None:
+        self.frame = np.zeros((4, 4), dtype=np.uint8)
+        self.released = False
+
+    def grab(self) -> bool:
+        return True
+
+    def retrieve(self):
+        return True, self.frame
+
+    def release(self) -> None:
+        self.released = True
+
+
+class _FakeCamera(_FakeCapture):
+    """Имитация открытой камеры, запоминающая заданные свойства потока."""
+
+    def __init__(self, frame: np.ndarray) -> None:
+        super().__init__()
+        self.frame = frame
+        self.props: dict[int, float] = {}
+
+    def isOpened(self) -> bool:
+        return True
+
+    def set(self, prop: int, value: float) -> bool:
+        self.props[prop] = value
+        return True
+
+
+def test_capture_thread_publishes_frames_and_releases_camera() -> None:
+    capture = _FakeCapture()
+    slot = scanner._LatestFrame()
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=scanner._capture_frames, args=(capture, slot, stop), daemon=True
+    )
+    producer.start()
+
+    assert slot.take(timeout=1.0) is capture.frame
+    stop.set()
+    producer.join(timeout=1.0)
+    assert not producer.is_alive()
+    assert capture.released
+
+
+def _qr_array(box_size: int, dark: int = 0, light: int = 255) -> np.ndarray:
+    image = np.array(generator.build_qr_image("https://example.com", box_size=box_size))
+    # В режиме "1" True — белый модуль
+    return np.where(image, light, dark).astype(np.uint8)
+
+
+def _camera_frame(background: np.ndarray, qr: np.ndarray, x: int) -> np.ndarray:
+    frame = background.copy()
+    top = (frame.shape[0] - qr.shape[0]) // 2
+    frame[top : top + qr.shape[0], x : x + qr.shape[1]] = qr
+    return frame
+
+
+@pytest.mark.parametrize("box_size", [3, 6, 12])
+def test_finder_prefilter_accepts_generated_qr(box_size: int) -> None:
+    assert scanner._has_finder_pattern(_qr_array(box_size))
+
+
+def test_finder_prefilter_rejects_blank_and_gradient_frames() -> None:
+    blank = np.full((540, 960), 128, dtype=np.uint8)
+    gradient = np.tile(np.linspace(0, 255, 960).astype(np.uint8), (540, 1))
+    assert not scanner._has_finder_pattern(blank)
+    assert not scanner._has_finder_pattern(gradient)
+
+
+def test_finder_prefilter_handles_uneven_lighting() -> None:
+    half_dark = np.full((540, 960), 230, dtype=np.uint8)
+    half_dark[:, :480] = 30
+    in_shadow = _camera_frame(half_dark, _qr_array(5, dark=10, light=100), 40)
+    bright_background = np.full((540, 960), 250, dtype=np.uint8)
+    on_glare = _camera_frame(bright_background, _qr_array(5, dark=60, light=160), 300)
+
+    assert scanner._has_finder_pattern(in_shadow)
+    assert scanner._has_finder_pattern(on_glare)
+    assert scanner._decode_frame(in_shadow, prefilter=True) == "https://example.com"
+
+
+@pytest.mark.parametrize("box_size", [2, 3])
+def test_scan_from_file_reads_small_qr_on_full_hd_screenshot(
+    tmp_path: Path, box_size: int
+) -> None:
+    payload = "https://example.com/screenshot"
+    canvas = Image.new("L", (1920, 1080), color=255)
+    canvas.paste(generator.build_qr_image(payload, box_size=box_size), (901, 473))
+    target = tmp_path / "screenshot.png"
+    canvas.save(target)
+
+    assert scanner.scan_from_file(str(target)) == payload
+
+
+def test_decode_frame_reads_grayscale_and_colour_frames() -> None:
+    gray = _qr_array(4)
+    colour = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+    assert scanner._decode_frame(gray) == "https://example.com"
+    assert scanner._decode_frame(colour) == "https://example.com"
+
+
+def test_decode_frame_falls_back_to_pyzbar(monkeypatch: pytest.MonkeyPatch) -> None:
+    detection = SimpleNamespace(data=b" fallback ")
+    monkeypatch.setattr(scanner, "decode", lambda gray: [detection])
+    blank = np.full((100, 100), 255, dtype=np.uint8)
+    assert scanner._decode_frame(blank) == "fallback"
+
+
+def test_scan_from_camera_requests_light_stream(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    frame = cv2.cvtColor(
+        _camera_frame(np.full((540, 960), 255, dtype=np.uint8), _qr_array(5), 300),
+        cv2.COLOR_GRAY2BGR,
+    )
+    camera = _FakeCamera(frame)
+    monkeypatch.setattr(scanner.cv2, "VideoCapture", lambda *args: camera)
+    monkeypatch.setattr(scanner.cv2, "destroyAllWindows", lambda: None)
+
+    assert scanner.scan_from_camera(timeout=5.0) == "https://example.com"
+    assert camera.props[cv2.CAP_PROP_BUFFERSIZE] == 1
+    assert camera.props[cv2.CAP_PROP_FOURCC] == cv2.VideoWriter_fourcc(*"MJPG")
+    assert camera.released
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from safeqr import security
 
 
@@ -10,6 +12,7 @@ def test_safe_https_url_has_no_warnings() -> None:
     assert result["safe"] is True
     assert result["warnings"] == []
     assert result["risk_level"] == "low"
+    assert result["normalized"] == "https://example.com/path"
 
 
 def test_risky_http_with_redirect_and_keyword() -> None:
@@ -29,3 +32,34 @@ def test_brand_spoof_with_unicode_letters() -> None:
     assert result["safe"] is False
     assert result["risk_level"] == "medium"
     assert any("похож" in item for item in result["warnings"])
+
+
+def test_repeated_keyword_is_reported_once() -> None:
+    result = security.check_url_safety("https://example.com/login/login?step=login")
+    keyword_warnings = [
+        item for item in result["warnings"] if "Подозрительное слово" in item
+    ]
+    assert keyword_warnings == ["Подозрительное слово в ссылке: login."]
+
+
+def test_brand_fragment_inside_longer_domain() -> None:
+    result = security.check_url_safety("https://netfllx-tv.com")
+    assert result["risk_level"] == "medium"
+    assert any("фрагмент" in item and "netflix" in item for item in result["warnings"])
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["https://banana.com", "https://bandcamp.com", "https://application.com"],
+)
+def test_partial_overlap_with_brand_is_not_a_fragment(url: str) -> None:
+    result = security.check_url_safety(url)
+    assert result["safe"] is True
+    assert result["warnings"] == []
+
+
+@pytest.mark.parametrize("url", ["https://news.google.com", "https://www.paypal.com"])
+def test_real_brand_subdomain_has_no_warnings(url: str) -> None:
+    result = security.check_url_safety(url)
+    assert result["safe"] is True
+    assert result["warnings"] == []
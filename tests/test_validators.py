@@ -21,3 +21,17 @@ def test_ascii_skeleton_handles_confusables_and_unicode() -> None:
     skeleton = validators.ascii_skeleton("аpple.com")
     assert skeleton == "apple.com"
     assert validators.has_suspicious_unicode("xn--e1afmkfd.xn--p1ai")
+
+
+def test_normalize_url_keeps_clean_urls_and_still_drops_fragments() -> None:
+    clean = "https://example.com/path/page?q=1&next=2"
+    assert validators.normalize_url(clean) == clean
+    assert validators.normalize_url(clean + "#top") == clean
+    assert validators.normalize_url("https://example.com/a+b") == "https://example.com/a%2Bb"
+
+
+def test_ascii_skeleton_many_matches_single_calls() -> None:
+    values = ["аpple.com", "mícrosoft.com", "xn--e1afmkfd.xn--p1ai", "", "PAYPAL.com"]
+    expected = [validators.ascii_skeleton(value) for value in values]
+    assert validators.ascii_skeleton_many(values) == expected
+    assert validators.ascii_skeleton_many([]) == []
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import base64
-from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
@@ -17,8 +16,10 @@ from safeqr import web
 @pytest.fixture(autouse=True)
 def _reset_recent_checks() -> None:
     web._recent_checks.clear()
+    web._recent_snapshot = ()
     yield
     web._recent_checks.clear()
+    web._recent_snapshot = ()
 
 
 def test_healthcheck_endpoint() -> None:
@@ -29,18 +30,16 @@ def test_healthcheck_endpoint() -> None:
 
 
 def test_generate_endpoint_returns_embedded_image(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     png_bytes = base64.b64decode(
         "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAusB9Y8lgtwAAAAASUVORK5CYII="
     )
 
-    def fake_generate(data: str, filename: str, **_: object) -> str:
-        path = Path(filename)
-        path.write_bytes(png_bytes)
-        return str(path)
+    def fake_generate_bytes(data: str, **_: object) -> bytes:
+        return png_bytes
 
-    monkeypatch.setattr(web.generator, "generate_qr", fake_generate)
+    monkeypatch.setattr(web.generator, "generate_qr_bytes", fake_generate_bytes)
     client = TestClient(web.app)
     response = client.post("/generate", data={"data": "https://example.com"})
 
@@ -67,3 +66,14 @@ def test_scan_endpoint_renders_security_report(
     html = response.text
     assert "http://example.com/login" in html
     assert "risk-medium" in html or "RISK" in html
+
+
+def test_scan_endpoint_rejects_empty_upload() -> None:
+    client = TestClient(web.app)
+    response = client.post(
+        "/scan",
+        files={"qr_file": ("qr.png", b"", "image/png")},
+    )
+
+    assert response.status_code == 200
+    assert "Загружен пустой файл." in response.text